@@ -76,12 +76,25 @@ CREATE TABLE IF NOT EXISTS temperature_readings (
     time_local_text TEXT NOT NULL,  -- Original timestamp string from CSV
     time_utc INTEGER NOT NULL,  -- Unix epoch seconds in UTC
     value_c REAL NOT NULL,  -- Temperature in Celsius
-    quality_flag INTEGER DEFAULT 0,  -- 0=good, non-zero=flagged
+    quality_flag INTEGER NOT NULL DEFAULT 0,  -- 0=good, non-zero=flagged
     FOREIGN KEY (file_id) REFERENCES files(file_id),
     FOREIGN KEY (deployment_id) REFERENCES deployments(deployment_id),
     FOREIGN KEY (sensor_id) REFERENCES sensors(sensor_id)
 );
 
+-- =============================================================================
+-- Table: file_hash_cache
+-- SHA256 of CSV files by path, size and modification time, so unchanged files
+-- can be recognized without re-reading them
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS file_hash_cache (
+    path TEXT NOT NULL,  -- Absolute path to the file
+    mtime_ns INTEGER NOT NULL,  -- Modification time (ns) when hashed
+    size INTEGER NOT NULL,  -- File size (bytes) when hashed
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (path, mtime_ns, size)
+);
+
 -- =============================================================================
 -- Indexes for efficient querying
 -- =============================================================================
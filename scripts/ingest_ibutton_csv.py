@@ -24,22 +24,76 @@ Example:
 
 import argparse
 import csv
+import io
 import json
+import os
 import sqlite3
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from itertools import chain, repeat
+from typing import Container, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 from utils import (
     get_db_connection,
+    enable_wal,
     initialize_database,
-    compute_file_hash,
-    local_to_utc,
-    file_already_ingested
+    get_timezone,
+    parse_local_time,
+    local_datetime_to_utc,
+    local_to_utc_batch,
+    get_ingested_files,
+    has_file_hash_cache,
+    get_cached_file_hashes,
+    cache_file_hash,
+    transaction,
+    HashingReader,
+    max_bound_parameters,
+    advise_sequential_read,
+    release_file_pages
 )
 
+# Number of readings parsed and inserted per batch
+READINGS_BATCH_SIZE = 10_000
+
+# Columns written for each reading, in tuple order; quality_flag is left
+# to its schema default (0)
+READINGS_COLUMNS = ('file_id', 'deployment_id', 'sensor_id', 'time_local_text',
+                    'time_utc', 'value_c')
+
+# Upper bound on rows per multi-row INSERT statement
+MAX_ROWS_PER_INSERT = 500
+
+# Worker threads reading and parsing CSV files ahead of the database writer
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Files parsed ahead of the one being ingested. Each is held fully parsed in
+# memory, so this stays small however many cores there are.
+PREFETCH_WINDOW = min(os.cpu_count() or 1, 4)
+
+
+class ReadingColumns(NamedTuple):
+    """One batch of parsed readings, stored column-wise."""
+    time_local_text: List[str]
+    time_utc: List[int]
+    value_c: List[float]
+
+
+class ParsedCSV(NamedTuple):
+    """An iButton CSV file read and parsed, ready to be written to the database."""
+    file_hash: str
+    stat: os.stat_result  # Taken before the file was read
+    metadata: Optional[Dict[str, str]]  # None if the file was already ingested
+    readings: Iterable[ReadingColumns]
+    warnings: List[str]
+
 
 def load_deployment_metadata(csv_dir: str) -> Dict:
     """
@@ -58,7 +112,32 @@ def load_deployment_metadata(csv_dir: str) -> Dict:
     return {}
 
 
-def parse_ibutton_header(csv_path: str) -> Tuple[Dict[str, str], int]:
+def read_ibutton_csv(csv_path: str) -> Tuple[str, io.StringIO]:
+    """
+    Read an iButton CSV file from disk once, for both hashing and parsing.
+    
+    Args:
+        csv_path: Path to the iButton CSV file
+        
+    Returns:
+        Tuple of (sha256_hex, text_buffer) where text_buffer holds the
+        decoded file contents, positioned at the first line
+    """
+    # The bytes are hashed as they are read rather than in a second pass.
+    # The file is read once, start to finish, and not again, so let the
+    # kernel read ahead and then drop it from the page cache.
+    with HashingReader(open(csv_path, 'rb')) as reader:
+        advise_sequential_read(reader.raw)
+        data = reader.read()
+        release_file_pages(reader.raw)
+    text = data.decode('utf-8-sig')  # utf-8-sig removes BOM
+    # Trailing blank lines carry no readings, and a read_csv() chunk made
+    # only of them fails to parse
+    return reader.hexdigest(), io.StringIO(text.rstrip())
+
+
+def parse_ibutton_header(buffer: io.StringIO, 
+                         csv_path: str) -> Tuple[Dict[str, str], int]:
     """
     Parse the header metadata block from an iButton CSV file.
     
@@ -66,8 +145,12 @@ def parse_ibutton_header(csv_path: str) -> Tuple[Dict[str, str], int]:
     - Header: Key-value pairs (e.g., "Part Number,DS1925L")
     - Data: Starts with "Date/Time,Unit,Value" or similar
     
+    The buffer is consumed up to and including the data header row, so
+    reading it further yields the data rows.
+    
     Args:
-        csv_path: Path to the iButton CSV file
+        buffer: Text buffer from read_ibutton_csv(), positioned at the start
+        csv_path: Path to the iButton CSV file (used in error messages)
         
     Returns:
         Tuple of (metadata_dict, data_start_line)
@@ -75,31 +158,32 @@ def parse_ibutton_header(csv_path: str) -> Tuple[Dict[str, str], int]:
     metadata = {}
     data_start_line = 0
     
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:  # utf-8-sig removes BOM
-        reader = csv.reader(f)
-        for i, row in enumerate(reader, start=1):
-            if not row or len(row) == 0:
-                continue
-            
-            # Check if this is the data header
-            if row[0].strip().lower() in ['date/time', 'date time']:
-                data_start_line = i
-                break
-            
-            # Parse header key-value pairs
-            # Handle both "Key,Value" and "Key: Value" formats
-            if len(row) >= 2:
-                # CSV format: "Key,Value"
-                key = row[0].strip().rstrip(':')  # Remove trailing colon
-                value = row[1].strip() if len(row) > 1 else ""
+    # csv.reader pulls one line at a time from the buffer, so the buffer
+    # stops right after the data header row
+    reader = csv.reader(buffer)
+    for row in reader:
+        if not row or len(row) == 0:
+            continue
+        
+        # Check if this is the data header
+        if row[0].strip().lower() in ['date/time', 'date time']:
+            data_start_line = reader.line_num
+            break
+        
+        # Parse header key-value pairs
+        # Handle both "Key,Value" and "Key: Value" formats
+        if len(row) >= 2:
+            # CSV format: "Key,Value"
+            key = row[0].strip().rstrip(':')  # Remove trailing colon
+            value = row[1].strip() if len(row) > 1 else ""
+            metadata[key] = value
+        elif len(row) == 1 and ':' in row[0]:
+            # Colon-separated format: "Key: Value"
+            parts = row[0].split(':', 1)
+            if len(parts) == 2:
+                key = parts[0].strip()
+                value = parts[1].strip()
                 metadata[key] = value
-            elif len(row) == 1 and ':' in row[0]:
-                # Colon-separated format: "Key: Value"
-                parts = row[0].split(':', 1)
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    value = parts[1].strip()
-                    metadata[key] = value
     
     if data_start_line == 0:
         raise ValueError(f"Could not find data section in {csv_path}")
@@ -145,11 +229,7 @@ def get_or_create_sensor(conn: sqlite3.Connection, metadata: Dict[str, str],
         
         # Update label if we have one and sensor doesn't have it
         if label and not existing_label:
-            conn.execute(
-                "UPDATE sensors SET label = ? WHERE sensor_id = ?",
-                (label, sensor_id)
-            )
-            conn.commit()
+            update_sensor_label(conn, sensor_id, label)
         return sensor_id
     
     # Create new sensor
@@ -160,10 +240,27 @@ def get_or_create_sensor(conn: sqlite3.Connection, metadata: Dict[str, str],
         """,
         ('ibutton_ds1925', part_number, registration_number, label)
     )
-    conn.commit()
     return cursor.lastrowid
 
 
+def update_sensor_label(conn: sqlite3.Connection, sensor_id: int, 
+                        label: str = None) -> None:
+    """
+    Set a sensor's label if one is given and the sensor doesn't have one yet.
+    
+    Args:
+        conn: Database connection
+        sensor_id: Sensor ID
+        label: Optional human-readable label for the sensor
+    """
+    if not label:
+        return
+    conn.execute(
+        "UPDATE sensors SET label = ? WHERE sensor_id = ? AND (label IS NULL OR label = '')",
+        (label, sensor_id)
+    )
+
+
 def upsert_sensor_deployment(conn: sqlite3.Connection, sensor_id: int, 
                              deployment_id: int, location_notes: str = None,
                              notes: str = None) -> None:
@@ -199,7 +296,6 @@ def upsert_sensor_deployment(conn: sqlite3.Connection, sensor_id: int,
                VALUES (?, ?, ?, ?)""",
             (sensor_id, deployment_id, location_notes, notes)
         )
-    conn.commit()
 
 
 def get_or_create_deployment(conn: sqlite3.Connection, name: str, site: str, 
@@ -231,7 +327,6 @@ def get_or_create_deployment(conn: sqlite3.Connection, name: str, site: str,
                 "UPDATE deployments SET notes = ? WHERE deployment_id = ?",
                 (notes, deployment_id)
             )
-            conn.commit()
         return deployment_id
     
     cursor = conn.execute(
@@ -241,13 +336,224 @@ def get_or_create_deployment(conn: sqlite3.Connection, name: str, site: str,
         """,
         (name, site, timezone_name, notes)
     )
-    conn.commit()
     return cursor.lastrowid
 
 
+def parse_readings(buffer: io.StringIO, data_start_line: int, timezone_name: str,
+                   fixed_offset: str = None, 
+                   warnings: List[str] = None) -> Iterator[ReadingColumns]:
+    """
+    Parse the data section of an iButton CSV file, one chunk at a time.
+    
+    The data section is tokenized by pandas' C parser and timestamps are
+    converted a chunk at a time. Rows the vectorized path cannot handle
+    (unexpected formats, DST gaps, bad values) are retried one at a time;
+    rows that still cannot be parsed are reported and skipped.
+    
+    Does not touch the database, so it can run in a worker thread.
+    
+    Args:
+        buffer: Text buffer positioned just after the data header row
+        data_start_line: Line number of the data header row
+        timezone_name: IANA timezone name for timestamp conversion
+        fixed_offset: Optional fixed UTC offset (e.g., "-04:00") to bypass DST
+        warnings: Optional list that collects messages for skipped rows;
+            they are printed immediately if not given
+        
+    Yields:
+        (time_local_text, time_utc, value_c) column lists for up to
+        READINGS_BATCH_SIZE rows
+    """
+    # Resolve the timezone once; the timestamp format is pinned by the
+    # first row and only re-detected if a later row doesn't match it
+    tz = get_timezone(timezone_name, fixed_offset)
+    fmt = None
+    
+    chunks = pd.read_csv(
+        buffer, header=None, usecols=[0, 1, 2], names=['time', 'unit', 'value'],
+        dtype=str, keep_default_na=False, skip_blank_lines=False,
+        skipinitialspace=True, chunksize=READINGS_BATCH_SIZE
+    )
+    for chunk in chunks:
+        # Only the timestamp is stored as text, so only it is stripped.
+        # Values need no copy: skipinitialspace drops leading blanks in the
+        # tokenizer and float() accepts trailing ones.
+        times = chunk['time'].fillna('').str.strip()
+        values = chunk['value'].fillna('')
+        
+        if fmt is None:
+            first = next((t for t in times if t), None)
+            try:
+                _, fmt = parse_local_time(first)
+            except (TypeError, ValueError):
+                pass
+        
+        # Vectorized conversion; anything unparseable comes out as NaN and
+        # is left to the slow path below
+        epochs = local_to_utc_batch(times, timezone_name, fixed_offset, fmt) if fmt \
+            else np.full(len(times), np.nan)
+        keep = ((times != '') & (values != '')).to_numpy(copy=True)
+        numbers = np.full(len(values), np.nan)
+        try:
+            # astype(float) rounds exactly like float(); to_numeric() can be
+            # off by an ulp on long decimals, so it only handles bad values
+            numbers[keep] = values[keep].astype(float).to_numpy()
+        except ValueError:
+            numbers[keep] = pd.to_numeric(values[keep], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        
+        # Retry the rows the vectorized path couldn't handle one at a time,
+        # patching their results in place
+        for i in np.flatnonzero(keep & (np.isnan(epochs) | np.isnan(numbers))):
+            try:
+                # Convert timestamp
+                dt, fmt = parse_local_time(times.iat[i], fmt)
+                epochs[i] = local_datetime_to_utc(dt, tz)
+                
+                # Parse temperature value
+                numbers[i] = float(values.iat[i])
+            except (ValueError, Exception) as e:
+                message = f"⚠️  Warning: Could not parse row {data_start_line + 1 + chunk.index[i]}: {e}"
+                if warnings is None:
+                    print(message)
+                else:
+                    warnings.append(message)
+                keep[i] = False
+        
+        yield ReadingColumns(
+            times[keep].tolist(),
+            epochs[keep].astype(np.int64).tolist(),
+            numbers[keep].tolist()
+        )
+
+
+def parse_csv_file(csv_path: str, timezone_name: str, fixed_offset: str = None,
+                   skip_hashes: Container[str] = (), known_hash: str = None) -> ParsedCSV:
+    """
+    Read, hash and parse an iButton CSV file without touching the database.
+    
+    The returned readings are parsed lazily as they are iterated; collect
+    them first (as prefetch_csv_file() does) to do the parsing up front.
+    
+    Args:
+        csv_path: Path to CSV file
+        timezone_name: IANA timezone name for timestamp conversion
+        fixed_offset: Optional fixed UTC offset (e.g., "-04:00") to bypass DST
+        skip_hashes: Hashes of already ingested files; these are not parsed
+        known_hash: Optional cached hash of the file (from get_cached_file_hashes());
+            if it is in skip_hashes the file is not read at all
+        
+    Returns:
+        ParsedCSV; metadata is None if the file's hash is in skip_hashes
+    """
+    if not Path(csv_path).exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    
+    stat = os.stat(csv_path)
+    if known_hash is not None and known_hash in skip_hashes:
+        return ParsedCSV(known_hash, stat, None, iter(()), [])
+    
+    # Read the file once; the header is parsed off the same buffer
+    file_hash, buffer = read_ibutton_csv(csv_path)
+    if file_hash in skip_hashes:
+        return ParsedCSV(file_hash, stat, None, iter(()), [])
+    
+    metadata, data_start_line = parse_ibutton_header(buffer, csv_path)
+    warnings = []
+    readings = parse_readings(buffer, data_start_line, timezone_name, fixed_offset, warnings)
+    return ParsedCSV(file_hash, stat, metadata, readings, warnings)
+
+
+def prefetch_csv_file(csv_path: str, timezone_name: str, fixed_offset: str = None,
+                      skip_hashes: Container[str] = (), known_hash: str = None) -> ParsedCSV:
+    """
+    Fully parse an iButton CSV file in a worker thread.
+    
+    Same as parse_csv_file(), but the readings are parsed before returning.
+    
+    Returns:
+        ParsedCSV with readings as a list of ReadingColumns
+    """
+    parsed = parse_csv_file(csv_path, timezone_name, fixed_offset, skip_hashes, known_hash)
+    return parsed._replace(readings=list(parsed.readings))
+
+
+def prefetch_csv_files(executor: ThreadPoolExecutor, csv_files: List[Path],
+                       timezone_name: str, fixed_offset: str = None,
+                       skip_hashes: Container[str] = (),
+                       known_hashes: Dict[str, str] = None,
+                       window: int = 1) -> Iterator[Tuple[Path, Future]]:
+    """
+    Parse CSV files in the background, a bounded number ahead of the caller.
+    
+    Args:
+        executor: Thread pool to parse in
+        csv_files: CSV files, in ingest order
+        timezone_name: IANA timezone name for timestamp conversion
+        fixed_offset: Optional fixed UTC offset (e.g., "-04:00") to bypass DST
+        skip_hashes: Hashes of already ingested files; these are not parsed
+        known_hashes: Optional cached hashes by path, from get_cached_file_hashes()
+        window: Number of files to keep parsing ahead of the one being ingested
+        
+    Yields:
+        (csv_file, future) pairs in order; each future resolves to a ParsedCSV
+    """
+    known_hashes = known_hashes or {}
+    pending = deque()
+    for csv_file in csv_files:
+        pending.append((csv_file, executor.submit(
+            prefetch_csv_file, str(csv_file), timezone_name, fixed_offset, skip_hashes,
+            known_hashes.get(str(csv_file))
+        )))
+        if len(pending) > window:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+@lru_cache(maxsize=None)
+def insert_readings_sql(num_rows: int) -> str:
+    """
+    Build the multi-row INSERT statement for a given number of readings.
+    
+    Cached so every batch submits the identical SQL string, which keeps
+    the connection's prepared-statement cache hitting.
+    
+    Args:
+        num_rows: Number of rows in the VALUES list
+        
+    Returns:
+        SQL text with one placeholder group per row
+    """
+    row_placeholder = "(" + ", ".join("?" * len(READINGS_COLUMNS)) + ")"
+    return (f"INSERT INTO temperature_readings ({', '.join(READINGS_COLUMNS)}) VALUES "
+            + ", ".join([row_placeholder] * num_rows))
+
+
+def insert_readings(conn: sqlite3.Connection, readings: List[Tuple]) -> None:
+    """
+    Insert reading tuples using multi-row INSERT ... VALUES statements.
+    
+    Packing many rows into one statement cuts the per-row statement overhead
+    of executemany(). Rows per statement are capped so the bound parameters
+    stay within SQLite's variable limit (999 on older builds).
+    
+    Args:
+        conn: Database connection
+        readings: Tuples matching READINGS_COLUMNS
+    """
+    num_columns = len(READINGS_COLUMNS)
+    rows_per_insert = max(1, min(MAX_ROWS_PER_INSERT, max_bound_parameters(conn) // num_columns))
+    
+    for start in range(0, len(readings), rows_per_insert):
+        rows = readings[start:start + rows_per_insert]
+        conn.execute(insert_readings_sql(len(rows)), list(chain.from_iterable(rows)))
+
+
 def ingest_csv_file(conn: sqlite3.Connection, csv_path: str, 
                     deployment_id: int, timezone_name: str,
-                    deployment_metadata: Dict = None, fixed_offset: str = None) -> None:
+                    deployment_metadata: Dict = None, fixed_offset: str = None,
+                    ingested_files: Dict[str, int] = None,
+                    parsed: Optional[Future] = None) -> None:
     """
     Ingest a single iButton CSV file.
     
@@ -258,16 +564,24 @@ def ingest_csv_file(conn: sqlite3.Connection, csv_path: str,
         timezone_name: IANA timezone name for timestamp conversion
         deployment_metadata: Optional deployment metadata dictionary
         fixed_offset: Optional fixed UTC offset (e.g., "-04:00") to bypass DST
+        ingested_files: Optional mapping of sha256 -> sensor_id from
+            get_ingested_files(); loaded from the database if not given and
+            updated with this file once it is ingested
+        parsed: Optional Future for this file from prefetch_csv_files();
+            the file is parsed here if not given
     """
     if deployment_metadata is None:
         deployment_metadata = {}
+    if ingested_files is None:
+        ingested_files = get_ingested_files(conn)
     csv_file = Path(csv_path)
-    if not csv_file.exists():
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
     
-    # Parse header
     print(f"📄 Parsing: {csv_file.name}")
-    metadata, data_start_line = parse_ibutton_header(csv_path)
+    if parsed is None:
+        parsed = parse_csv_file(csv_path, timezone_name, fixed_offset, ingested_files)
+    else:
+        parsed = parsed.result()
+    file_hash = parsed.file_hash
     
     # Extract label from filename (e.g., "Antenna_iButton_Dec2025.csv" -> "Antenna")
     filename = csv_file.stem  # Remove extension
@@ -281,20 +595,24 @@ def ingest_csv_file(conn: sqlite3.Connection, csv_path: str,
     location_notes = sensor_metadata.get('location')  # Only use location field
     sensor_notes = sensor_metadata.get('notes')
     
-    # Get or create sensor (do this before hash check to update labels)
+    # Check if already ingested. The sensor is known from the earlier
+    # ingest, so skip parsing but still refresh its label and
+    # deployment-specific metadata.
+    if file_hash in ingested_files:
+        sensor_id = ingested_files[file_hash]
+        update_sensor_label(conn, sensor_id, label)
+        upsert_sensor_deployment(conn, sensor_id, deployment_id, location_notes, sensor_notes)
+        print(f"⚠️  File already ingested (skipping): {csv_file.name}")
+        return
+    
+    metadata = parsed.metadata
+    
+    # Get or create sensor
     sensor_id = get_or_create_sensor(conn, metadata, label)
     
     # Create/update sensor_deployment record with deployment-specific metadata
     upsert_sensor_deployment(conn, sensor_id, deployment_id, location_notes, sensor_notes)
     
-    # Compute file hash
-    file_hash = compute_file_hash(csv_path)
-    
-    # Check if already ingested
-    if file_already_ingested(conn, file_hash):
-        print(f"⚠️  File already ingested (skipping): {csv_file.name}")
-        return
-    
     # Insert file record with enhanced metadata
     file_metadata = metadata.copy()
     if sensor_notes:
@@ -309,61 +627,58 @@ def ingest_csv_file(conn: sqlite3.Connection, csv_path: str,
     )
     file_id = cursor.lastrowid
     
-    # Parse and insert temperature readings
-    readings = []
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.reader(f)
+    # Insert temperature readings one parsed batch at a time; the row
+    # tuples are assembled with zip() rather than a Python-level loop
+    num_readings = 0
+    for times, epochs, values in parsed.readings:
+        for message in parsed.warnings:
+            print(message)
+        parsed.warnings.clear()
         
-        # Skip to data section
-        for i, row in enumerate(reader, start=1):
-            if i < data_start_line:
-                continue
-            if i == data_start_line:
-                # This is the header row
-                continue
-            
-            # Parse data row
-            if len(row) < 3:
-                continue
-            
-            time_local_text = row[0].strip()
-            unit = row[1].strip()
-            value_str = row[2].strip()
-            
-            if not time_local_text or not value_str:
-                continue
-            
-            try:
-                # Convert timestamp
-                time_utc = local_to_utc(time_local_text, timezone_name, fixed_offset)
-                
-                # Parse temperature value
-                value_c = float(value_str)
-                
-                readings.append((
-                    file_id, deployment_id, sensor_id,
-                    time_local_text, time_utc, value_c, 0
-                ))
-            except (ValueError, Exception) as e:
-                print(f"⚠️  Warning: Could not parse row {i}: {e}")
-                continue
-    
-    # Bulk insert readings
-    if readings:
-        conn.executemany(
-            """
-            INSERT INTO temperature_readings 
-            (file_id, deployment_id, sensor_id, time_local_text, time_utc, value_c, quality_flag)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            readings
-        )
-        conn.commit()
-        print(f"✓ Ingested {len(readings)} readings from {csv_file.name}")
+        n = len(times)
+        insert_readings(conn, list(zip(
+            repeat(file_id, n), repeat(deployment_id, n), repeat(sensor_id, n),
+            times, epochs, values
+        )))
+        num_readings += n
+    for message in parsed.warnings:
+        print(message)
+    
+    ingested_files[file_hash] = sensor_id
+    
+    if num_readings:
+        print(f"✓ Ingested {num_readings} readings from {csv_file.name}")
     else:
         print(f"⚠️  No valid readings found in {csv_file.name}")
 
 
+def drop_reading_indexes(conn: sqlite3.Connection) -> List[str]:
+    """
+    Drop the secondary indexes on temperature_readings.
+    
+    Rebuilding an index once after a bulk load (one sorted pass) is much
+    faster than updating it for every inserted row. Run this inside the
+    ingest transaction so a rollback also restores the indexes.
+    
+    Args:
+        conn: Database connection
+        
+    Returns:
+        CREATE INDEX statements to execute to rebuild the dropped indexes
+    """
+    cursor = conn.execute(
+        """
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = 'temperature_readings'
+          AND name NOT LIKE 'sqlite_%' AND sql IS NOT NULL
+        """
+    )
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        conn.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in indexes]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Ingest iButton temperature CSV files into database",
@@ -383,6 +698,9 @@ def main():
                        help='Optional deployment notes (overrides deployment_metadata.json)')
     parser.add_argument('--init-db', action='store_true',
                        help='Initialize database with schema before ingesting')
+    parser.add_argument('--fast-load', action='store_true',
+                       help='Drop temperature_readings indexes during ingest and rebuild them afterwards '
+                            '(faster for large first-time loads)')
     
     args = parser.parse_args()
     
@@ -393,7 +711,10 @@ def main():
     
     # Connect to database
     conn = get_db_connection(args.db_path)
-    
+    # Manage transactions explicitly (see BEGIN/COMMIT below)
+    conn.isolation_level = None
+    enable_wal(conn, args.db_path)
+
     try:
         # Convert deployment path to Path object and validate
         deployment_dir = Path(args.deployment_path)
@@ -428,21 +749,55 @@ def main():
         # Use deployment notes from metadata if not provided via command line
         deployment_notes = args.notes or deployment_metadata.get('deployment_notes')
         
-        # Get or create deployment
-        deployment_id = get_or_create_deployment(
-            conn, deployment_name, site_name, timezone_name, deployment_notes
-        )
-        print(f"\n📊 Deployment: {deployment_name} (ID: {deployment_id})")
-        print(f"📍 Site: {site_name}")
-        print(f"🕐 Timezone: {timezone_name}{f' (fixed offset: {fixed_offset})' if fixed_offset else ''}\n")
-        
-        # Ingest each CSV file
-        for csv_file in csv_files:
-            try:
-                ingest_csv_file(conn, str(csv_file), deployment_id, timezone_name, deployment_metadata, fixed_offset)
-            except Exception as e:
-                print(f"❌ Error processing {csv_file}: {e}")
-                continue
+        # Run the whole ingest in a single transaction so SQLite only syncs
+        # once at COMMIT instead of after every sensor, file and batch
+        with transaction(conn):
+            # Get or create deployment
+            deployment_id = get_or_create_deployment(
+                conn, deployment_name, site_name, timezone_name, deployment_notes
+            )
+            print(f"\n📊 Deployment: {deployment_name} (ID: {deployment_id})")
+            print(f"📍 Site: {site_name}")
+            print(f"🕐 Timezone: {timezone_name}{f' (fixed offset: {fixed_offset})' if fixed_offset else ''}\n")
+            
+            # Look up previously ingested files once for the whole directory
+            ingested_files = get_ingested_files(conn)
+            
+            # Files unchanged since they were last hashed are recognized
+            # without reading them
+            use_hash_cache = has_file_hash_cache(conn)
+            known_hashes = get_cached_file_hashes(conn, csv_files) if use_hash_cache else {}
+            
+            if args.fast_load:
+                index_sql = drop_reading_indexes(conn)
+            
+            # Ingest each CSV file; a savepoint per file discards partial work
+            # from a failed file without losing the files before it. Files
+            # are read and parsed by worker threads ahead of the single
+            # database writer.
+            with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+                prefetched = prefetch_csv_files(executor, csv_files, timezone_name, fixed_offset,
+                                                ingested_files, known_hashes, window=PREFETCH_WINDOW)
+                for csv_file, parsed in prefetched:
+                    conn.execute("SAVEPOINT ingest_file")
+                    try:
+                        ingest_csv_file(conn, str(csv_file), deployment_id, timezone_name, deployment_metadata, fixed_offset,
+                                        ingested_files, parsed)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO ingest_file")
+                        print(f"❌ Error processing {csv_file}: {e}")
+                        continue
+                    else:
+                        if use_hash_cache:
+                            result = parsed.result()
+                            cache_file_hash(conn, str(csv_file), result.file_hash, result.stat)
+                    finally:
+                        conn.execute("RELEASE ingest_file")
+            
+            if args.fast_load:
+                print("🔧 Rebuilding temperature_readings indexes")
+                for sql in index_sql:
+                    conn.execute(sql)
         
         print("\n✅ Ingestion complete!")
         
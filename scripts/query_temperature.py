@@ -26,12 +26,79 @@ import pandas as pd
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
-from utils import get_db_connection
+from utils import pooled_connection
+
+# Rows fetched per chunk by the load_* functions
+LOAD_CHUNKSIZE = 100_000
+
+
+def read_query_chunked(query: str, conn: sqlite3.Connection, params: list = None,
+                       chunksize: Optional[int] = LOAD_CHUNKSIZE) -> pd.DataFrame:
+    """
+    Run a query into a DataFrame, fetching the result in chunks.
+    
+    pd.read_sql_query() otherwise fetches every row as a Python tuple before
+    building the frame; converting chunk by chunk keeps only one chunk of
+    tuples alive at a time, which lowers peak memory on large loads. The
+    column dtypes are the same as an unchunked read would give.
+    
+    Args:
+        query: SQL query
+        conn: Database connection
+        params: Optional query parameters
+        chunksize: Rows per chunk, or None to fetch everything at once
+        
+    Returns:
+        DataFrame with the full query result
+    """
+    if chunksize is None:
+        return pd.read_sql_query(query, conn, params=params)
+    chunks = pd.read_sql_query(query, conn, params=params, chunksize=chunksize)
+    df = pd.concat(chunks, ignore_index=True)
+    
+    # A chunk that is all NULL in a column comes back as object, and concat
+    # then leaves the whole column object; re-infer from the full column.
+    # Columns that stay object (mixed types) get NULLs back as None, not
+    # the NaN of chunks that happened to be all numeric.
+    for column in df.columns[df.dtypes == object]:
+        values = df[column].infer_objects()
+        if values.dtype == object:
+            values = values.where(values.notna(), None)
+        df[column] = values
+    return df
+
+
+def epoch_to_datetime(df: pd.DataFrame, columns: List[str]) -> None:
+    """
+    Convert columns of Unix epoch seconds to UTC datetimes in place.
+    
+    Queries return the raw INTEGER epoch and convert here in one vectorized
+    call per column, instead of formatting text with datetime() in SQL.
+    
+    Args:
+        df: DataFrame to modify
+        columns: Names of epoch-second columns to convert
+    """
+    for column in columns:
+        df[column] = pd.to_datetime(df[column], unit='s', utc=True)
+
+
+def add_time_utc_iso(df: pd.DataFrame) -> None:
+    """
+    Add a time_utc_iso column derived from time_utc, next to it.
+    
+    Args:
+        df: DataFrame with a time_utc column (Unix epoch seconds)
+    """
+    position = df.columns.get_loc('time_utc') + 1
+    df.insert(position, 'time_utc_iso', df['time_utc'])
+    epoch_to_datetime(df, ['time_utc_iso'])
 
 
 def load_deployment_data(db_path: str, deployment_name: str, 
                         start_time_utc: Optional[int] = None,
-                        end_time_utc: Optional[int] = None) -> pd.DataFrame:
+                        end_time_utc: Optional[int] = None,
+                        chunksize: Optional[int] = LOAD_CHUNKSIZE) -> pd.DataFrame:
     """
     Load all temperature data for a deployment.
     
@@ -40,23 +107,21 @@ def load_deployment_data(db_path: str, deployment_name: str,
         deployment_name: Name of the deployment
         start_time_utc: Optional start time (Unix epoch seconds)
         end_time_utc: Optional end time (Unix epoch seconds)
+        chunksize: Rows fetched per chunk (None to fetch all at once)
         
     Returns:
         DataFrame with columns:
             - time_utc: Unix epoch seconds
-            - time_utc_iso: ISO format UTC timestamp
+            - time_utc_iso: UTC timestamp (timezone-aware datetime)
             - time_local_text: Original local timestamp string
             - value_c: Temperature in Celsius
             - sensor_registration: Sensor registration number
             - sensor_label: Sensor label (if set)
             - quality_flag: Quality flag (0=good)
     """
-    conn = get_db_connection(db_path)
-    
     query = """
         SELECT 
             tr.time_utc,
-            datetime(tr.time_utc, 'unixepoch') AS time_utc_iso,
             tr.time_local_text,
             tr.value_c,
             s.registration_number AS sensor_registration,
@@ -80,15 +145,17 @@ def load_deployment_data(db_path: str, deployment_name: str,
     
     query += " ORDER BY tr.time_utc, s.registration_number"
     
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    with pooled_connection(db_path) as conn:
+        df = read_query_chunked(query, conn, params, chunksize)
     
+    add_time_utc_iso(df)
     return df
 
 
 def load_sensor_data(db_path: str, registration_number: str,
                     start_time_utc: Optional[int] = None,
-                    end_time_utc: Optional[int] = None) -> pd.DataFrame:
+                    end_time_utc: Optional[int] = None,
+                    chunksize: Optional[int] = LOAD_CHUNKSIZE) -> pd.DataFrame:
     """
     Load all temperature data for a specific sensor.
     
@@ -97,23 +164,21 @@ def load_sensor_data(db_path: str, registration_number: str,
         registration_number: Sensor registration number
         start_time_utc: Optional start time (Unix epoch seconds)
         end_time_utc: Optional end time (Unix epoch seconds)
+        chunksize: Rows fetched per chunk (None to fetch all at once)
         
     Returns:
         DataFrame with columns:
             - time_utc: Unix epoch seconds
-            - time_utc_iso: ISO format UTC timestamp
+            - time_utc_iso: UTC timestamp (timezone-aware datetime)
             - time_local_text: Original local timestamp string
             - value_c: Temperature in Celsius
             - deployment_name: Deployment name
             - site: Site name
             - quality_flag: Quality flag (0=good)
     """
-    conn = get_db_connection(db_path)
-    
     query = """
         SELECT 
             tr.time_utc,
-            datetime(tr.time_utc, 'unixepoch') AS time_utc_iso,
             tr.time_local_text,
             tr.value_c,
             d.name AS deployment_name,
@@ -137,14 +202,16 @@ def load_sensor_data(db_path: str, registration_number: str,
     
     query += " ORDER BY tr.time_utc"
     
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    with pooled_connection(db_path) as conn:
+        df = read_query_chunked(query, conn, params, chunksize)
     
+    add_time_utc_iso(df)
     return df
 
 
 def load_time_range_data(db_path: str, start_time_utc: int, end_time_utc: int,
-                         deployment_name: Optional[str] = None) -> pd.DataFrame:
+                         deployment_name: Optional[str] = None,
+                         chunksize: Optional[int] = LOAD_CHUNKSIZE) -> pd.DataFrame:
     """
     Load all temperature data within a time range.
     
@@ -153,16 +220,14 @@ def load_time_range_data(db_path: str, start_time_utc: int, end_time_utc: int,
         start_time_utc: Start time (Unix epoch seconds)
         end_time_utc: End time (Unix epoch seconds)
         deployment_name: Optional deployment filter
+        chunksize: Rows fetched per chunk (None to fetch all at once)
         
     Returns:
         DataFrame with all temperature data in time range
     """
-    conn = get_db_connection(db_path)
-    
     query = """
         SELECT 
             tr.time_utc,
-            datetime(tr.time_utc, 'unixepoch') AS time_utc_iso,
             tr.time_local_text,
             tr.value_c,
             s.registration_number AS sensor_registration,
@@ -184,9 +249,10 @@ def load_time_range_data(db_path: str, start_time_utc: int, end_time_utc: int,
     
     query += " ORDER BY tr.time_utc, d.name, s.registration_number"
     
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    with pooled_connection(db_path) as conn:
+        df = read_query_chunked(query, conn, params, chunksize)
     
+    add_time_utc_iso(df)
     return df
 
 
@@ -197,27 +263,47 @@ def list_deployments(db_path: str) -> pd.DataFrame:
     Returns:
         DataFrame with deployment information
     """
-    conn = get_db_connection(db_path)
-    
+    # Aggregate before joining so deployments only meet one row each.
+    # Reading stats come straight off idx_deployment_time; sensors are
+    # counted from the files that have readings (each file's readings carry
+    # that file's deployment and sensor) instead of a DISTINCT over readings.
     query = """
+        WITH reading_stats AS (
+            SELECT 
+                deployment_id,
+                COUNT(*) AS num_readings,
+                MIN(time_utc) AS first_time_utc,
+                MAX(time_utc) AS last_time_utc
+            FROM temperature_readings
+            GROUP BY deployment_id
+        ),
+        sensor_counts AS (
+            SELECT 
+                f.deployment_id,
+                COUNT(DISTINCT f.sensor_id) AS num_sensors
+            FROM files f
+            WHERE EXISTS (SELECT 1 FROM temperature_readings tr WHERE tr.file_id = f.file_id)
+            GROUP BY f.deployment_id
+        )
         SELECT 
             d.deployment_id,
             d.name,
             d.site,
             d.timezone_name,
-            COUNT(DISTINCT tr.sensor_id) AS num_sensors,
-            COUNT(tr.reading_id) AS num_readings,
-            datetime(MIN(tr.time_utc), 'unixepoch') AS first_reading_utc,
-            datetime(MAX(tr.time_utc), 'unixepoch') AS last_reading_utc
+            COALESCE(sc.num_sensors, 0) AS num_sensors,
+            COALESCE(rs.num_readings, 0) AS num_readings,
+            rs.first_time_utc AS first_reading_utc,
+            rs.last_time_utc AS last_reading_utc
         FROM deployments d
-        LEFT JOIN temperature_readings tr ON d.deployment_id = tr.deployment_id
-        GROUP BY d.deployment_id
+        LEFT JOIN reading_stats rs ON d.deployment_id = rs.deployment_id
+        LEFT JOIN sensor_counts sc ON d.deployment_id = sc.deployment_id
         ORDER BY d.name
     """
     
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    with pooled_connection(db_path) as conn:
+        df = pd.read_sql_query(query, conn)
     
+    epoch_to_datetime(df, ['first_reading_utc', 'last_reading_utc'])
     return df
 
 
@@ -228,25 +314,40 @@ def list_sensors(db_path: str) -> pd.DataFrame:
     Returns:
         DataFrame with sensor information
     """
-    conn = get_db_connection(db_path)
-    
+    # Aggregate before joining, as in list_deployments(): reading counts come
+    # off idx_sensor_time and deployments are counted from files with readings
     query = """
+        WITH reading_stats AS (
+            SELECT 
+                sensor_id,
+                COUNT(*) AS num_readings
+            FROM temperature_readings
+            GROUP BY sensor_id
+        ),
+        deployment_counts AS (
+            SELECT 
+                f.sensor_id,
+                COUNT(DISTINCT f.deployment_id) AS num_deployments
+            FROM files f
+            WHERE EXISTS (SELECT 1 FROM temperature_readings tr WHERE tr.file_id = f.file_id)
+            GROUP BY f.sensor_id
+        )
         SELECT 
             s.sensor_id,
             s.sensor_type,
             s.part_number,
             s.registration_number,
             s.label,
-            COUNT(DISTINCT tr.deployment_id) AS num_deployments,
-            COUNT(tr.reading_id) AS num_readings
+            COALESCE(dc.num_deployments, 0) AS num_deployments,
+            COALESCE(rs.num_readings, 0) AS num_readings
         FROM sensors s
-        LEFT JOIN temperature_readings tr ON s.sensor_id = tr.sensor_id
-        GROUP BY s.sensor_id
+        LEFT JOIN reading_stats rs ON s.sensor_id = rs.sensor_id
+        LEFT JOIN deployment_counts dc ON s.sensor_id = dc.sensor_id
         ORDER BY s.registration_number
     """
     
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    with pooled_connection(db_path) as conn:
+        df = pd.read_sql_query(query, conn)
     
     return df
 
@@ -262,29 +363,41 @@ def list_deployment_sensors(db_path: str, deployment_name: str) -> pd.DataFrame:
     Returns:
         DataFrame with sensor and location information for the deployment
     """
-    conn = get_db_connection(db_path)
-    
+    # Aggregate this deployment's readings per sensor first, then join the
+    # small per-sensor result to the sensor metadata
     query = """
+        WITH dep AS (
+            SELECT deployment_id FROM deployments WHERE name = ?
+        ),
+        agg AS (
+            SELECT 
+                sensor_id,
+                COUNT(*) AS num_readings,
+                MIN(time_utc) AS first_time_utc,
+                MAX(time_utc) AS last_time_utc
+            FROM temperature_readings
+            WHERE deployment_id = (SELECT deployment_id FROM dep)
+            GROUP BY sensor_id
+        )
         SELECT 
             s.sensor_id,
             s.label,
             s.registration_number,
             sd.location_notes AS location,
-            COUNT(tr.reading_id) AS num_readings,
-            datetime(MIN(tr.time_utc), 'unixepoch') AS first_reading_utc,
-            datetime(MAX(tr.time_utc), 'unixepoch') AS last_reading_utc
+            agg.num_readings,
+            agg.first_time_utc AS first_reading_utc,
+            agg.last_time_utc AS last_reading_utc
         FROM sensors s
         JOIN sensor_deployments sd ON s.sensor_id = sd.sensor_id
-        JOIN deployments d ON sd.deployment_id = d.deployment_id
-        JOIN temperature_readings tr ON s.sensor_id = tr.sensor_id AND d.deployment_id = tr.deployment_id
-        WHERE d.name = ?
-        GROUP BY s.sensor_id
+        JOIN agg ON s.sensor_id = agg.sensor_id
+        WHERE sd.deployment_id = (SELECT deployment_id FROM dep)
         ORDER BY s.label
     """
     
-    df = pd.read_sql_query(query, conn, params=[deployment_name])
-    conn.close()
+    with pooled_connection(db_path) as conn:
+        df = pd.read_sql_query(query, conn, params=[deployment_name])
     
+    epoch_to_datetime(df, ['first_reading_utc', 'last_reading_utc'])
     return df
 
 
@@ -295,9 +408,8 @@ def get_file_summary(db_path: str) -> pd.DataFrame:
     Returns:
         DataFrame with file ingestion summary
     """
-    conn = get_db_connection(db_path)
-    df = pd.read_sql_query("SELECT * FROM v_file_summary", conn)
-    conn.close()
+    with pooled_connection(db_path) as conn:
+        df = pd.read_sql_query("SELECT * FROM v_file_summary", conn)
     return df
 
 
@@ -8,27 +8,259 @@ Provides common functionality for:
 """
 
 import sqlite3
+import atexit
 import hashlib
+import io
+import mmap
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone, timedelta, tzinfo
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
+import pandas as pd
 
-def get_db_connection(db_path: str) -> sqlite3.Connection:
+# Number of prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 1024
+
+# Idle connections kept per database by pooled_connection()
+CONNECTION_POOL_SIZE = 4
+# Pools are keyed by (process id, path) so a forked child never reuses
+# connections it inherited from its parent
+CONNECTION_POOLS: Dict[Tuple[int, str], queue.LifoQueue] = {}
+CONNECTION_POOL_LOCK = threading.Lock()
+
+# Rows per executemany() call in bulk_insert()
+BULK_INSERT_BATCH_SIZE = 5000
+
+# Host parameters per statement on SQLite builds older than 3.32, used when
+# the connection can't report its limit
+DEFAULT_MAX_BOUND_PARAMETERS = 999
+
+
+def get_db_connection(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
     """
     Get a connection to the SQLite database.
     
+    The connection is tuned for bulk work: in-memory temp storage, a
+    64 MiB page cache and 256 MiB of memory-mapped I/O. Writers should
+    still group their inserts into transactions and call enable_wal()
+    themselves; the journal mode is left alone here so that read-only
+    databases can still be opened.
+    
     Args:
         db_path: Path to the .sqlite file
+        check_same_thread: Passed to sqlite3.connect(); False lets the
+            connection move between threads (one at a time)
         
     Returns:
         sqlite3.Connection with Row factory enabled
     """
-    conn = sqlite3.connect(db_path)
+    # A larger statement cache keeps the prepared statements of a whole
+    # ingest run (lookups, upserts, batched inserts) from being re-parsed
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE,
+                           check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
+    
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
     return conn
 
 
+def enable_wal(conn: sqlite3.Connection, db_path: str) -> None:
+    """
+    Switch a database to write-ahead logging.
+    
+    WAL lets query_temperature.py readers run while an ingest writes. The
+    mode is stored in the database file, so only writers should set it.
+    Once WAL is confirmed the connection also drops to synchronous=NORMAL,
+    which is only crash-safe in WAL mode. WAL needs shared memory between
+    processes, so keep the database on a local disk rather than a network
+    filesystem; where it is unavailable the connection keeps the default
+    journal and synchronous=FULL.
+    
+    Args:
+        conn: Connection about to write to the database
+        db_path: Path the connection was opened with
+    """
+    # WAL is not available for in-memory or temporary databases
+    if str(db_path) in (':memory:', ''):
+        return
+    try:
+        journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    except sqlite3.OperationalError as e:
+        # e.g. a read-only file or directory; keep the current journal mode
+        print(f"⚠️  Warning: Could not enable WAL journaling: {e}")
+        return
+    
+    # SQLite reports the mode actually in effect instead of raising when
+    # WAL is unsupported (e.g. no shared-memory VFS)
+    if journal_mode.lower() != 'wal':
+        print(f"⚠️  Warning: WAL journaling unavailable, using journal_mode={journal_mode}")
+        return
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+
+def database_file_id(db_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Identify the file behind a database path.
+    
+    Args:
+        db_path: Path to the .sqlite file
+        
+    Returns:
+        (st_dev, st_ino), or None if the file does not exist
+    """
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+@contextmanager
+def pooled_connection(db_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a reusable connection to the database.
+    
+    Connections come from get_db_connection() and go back to a small
+    per-database pool afterwards, so repeated calls (e.g. several load_*
+    calls from a notebook) skip opening the file and re-applying the
+    PRAGMAs. A pooled connection is dropped if the database file has been
+    replaced since it was opened, and any transaction left open is rolled
+    back before it is reused. Each process keeps its own pools, so it is
+    safe to fork after using this. In-memory databases are never pooled.
+    
+    Args:
+        db_path: Path to the .sqlite file
+        
+    Yields:
+        sqlite3.Connection with Row factory enabled
+    """
+    key = str(db_path)
+    if key in (':memory:', ''):
+        conn = get_db_connection(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+    
+    with CONNECTION_POOL_LOCK:
+        pool = CONNECTION_POOLS.setdefault((os.getpid(), key),
+                                           queue.LifoQueue(maxsize=CONNECTION_POOL_SIZE))
+    
+    file_id = database_file_id(db_path)
+    conn = None
+    while conn is None:
+        try:
+            pooled, pooled_file_id = pool.get_nowait()
+        except queue.Empty:
+            break
+        if pooled_file_id == file_id:
+            conn = pooled
+        else:
+            pooled.close()  # The file was deleted or replaced
+    if conn is None:
+        conn = get_db_connection(db_path, check_same_thread=False)
+        file_id = database_file_id(db_path)  # Connecting may create the file
+    
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            pool.put_nowait((conn, file_id))
+        except queue.Full:
+            conn.close()
+
+
+def close_pooled_connections() -> None:
+    """Close every idle connection this process holds in pooled_connection()."""
+    pid = os.getpid()
+    with CONNECTION_POOL_LOCK:
+        # Pools inherited through fork belong to the parent; leave them be
+        keys = [key for key in CONNECTION_POOLS if key[0] == pid]
+        pools = [CONNECTION_POOLS.pop(key) for key in keys]
+    for pool in pools:
+        while True:
+            try:
+                conn, _ = pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+# Close pooled connections cleanly so WAL files are checkpointed at exit
+atexit.register(close_pooled_connections)
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run a block of statements in one explicit transaction.
+    
+    Commits when the block finishes and rolls back if it raises (including
+    KeyboardInterrupt). Grouping writes this way means SQLite syncs once
+    at COMMIT instead of once per statement.
+    
+    Args:
+        conn: Database connection, not already in a transaction
+        
+    Yields:
+        The same connection
+    """
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def bulk_insert(conn: sqlite3.Connection, sql: str, rows: Iterable[Sequence],
+                batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    """
+    Insert many rows with executemany(), batch_size rows at a time.
+    
+    If the connection is not already in a transaction, each batch runs in
+    its own transaction; otherwise the rows become part of the caller's.
+    
+    Args:
+        conn: Database connection
+        sql: Single-row INSERT statement with ? placeholders
+        rows: Parameter tuples, one per row
+        batch_size: Rows per executemany() call
+        
+    Returns:
+        Number of rows inserted
+    """
+    rows = iter(rows)
+    num_rows = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        if conn.in_transaction:
+            conn.executemany(sql, batch)
+        else:
+            with transaction(conn):
+                conn.executemany(sql, batch)
+        num_rows += len(batch)
+    return num_rows
+
+
 def initialize_database(db_path: str, schema_path: str) -> None:
     """
     Initialize the database with the schema.
@@ -37,15 +269,17 @@ def initialize_database(db_path: str, schema_path: str) -> None:
         db_path: Path to the .sqlite file to create/initialize
         schema_path: Path to the temperature.sql schema file
     """
-    schema_file = Path(schema_path)
-    if not schema_file.exists():
-        raise FileNotFoundError(f"Schema file not found: {schema_path}")
-    
-    with open(schema_file, 'r') as f:
-        schema_sql = f.read()
+    # Open directly rather than checking exists() first; that check could
+    # race with the open and costs an extra stat
+    try:
+        with open(schema_path, 'rb') as f:
+            schema_sql = f.read().decode('utf-8')
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Schema file not found: {schema_path}") from e
     
     conn = get_db_connection(db_path)
     try:
+        enable_wal(conn, db_path)
         conn.executescript(schema_sql)
         conn.commit()
         print(f"Database initialized: {db_path}")
@@ -53,6 +287,48 @@ def initialize_database(db_path: str, schema_path: str) -> None:
         conn.close()
 
 
+# Bytes read per block when hashing files without hashlib.file_digest (1 MiB)
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files at least this large are hashed through a memory map (10 MiB)
+HASH_MMAP_THRESHOLD = 10 << 20
+
+
+def advise_sequential_read(f: BinaryIO) -> None:
+    """
+    Tell the kernel a file is about to be read start to finish.
+    
+    Lets Linux use a larger read-ahead window. No-op where posix_fadvise
+    is unavailable (Windows, macOS).
+    
+    Args:
+        f: Open binary file
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def release_file_pages(f: BinaryIO) -> None:
+    """
+    Tell the kernel a file's cached pages won't be needed again.
+    
+    Keeps one-shot reads of large archives from evicting more useful data
+    (such as the database) from the page cache. No-op where posix_fadvise
+    is unavailable.
+    
+    Args:
+        f: Open binary file
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
 def compute_file_hash(file_path: str) -> str:
     """
     Compute SHA256 hash of a file.
@@ -63,14 +339,399 @@ def compute_file_hash(file_path: str) -> str:
     Returns:
         Hex string of SHA256 hash
     """
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        # Read in chunks to handle large files
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        advise_sequential_read(f)
+        try:
+            return hash_file_object(f)
+        finally:
+            release_file_pages(f)
+
+
+def hash_file_object(f: BinaryIO) -> str:
+    """
+    Compute SHA256 hash of an open binary file, positioned at its start.
+    
+    Args:
+        f: Open binary file
+        
+    Returns:
+        Hex string of SHA256 hash
+    """
+    if os.fstat(f.fileno()).st_size >= HASH_MMAP_THRESHOLD:
+        # Hash large files straight from the page cache in one call
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        except (OSError, ValueError):
+            pass  # Not mappable; fall back to buffered reads
+    
+    if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+        # Runs the read/update loop in C
+        return hashlib.file_digest(f, "sha256").hexdigest()
+    
+    # Read in chunks to handle large files, reusing one buffer
+    sha256_hash = hashlib.sha256()
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        n = f.readinto(buffer)
+        if not n:
+            break
+        sha256_hash.update(view[:n])
     return sha256_hash.hexdigest()
 
 
+class HashingReader(io.RawIOBase):
+    """
+    Binary file wrapper that computes the SHA256 of everything read through it.
+    
+    Lets one pass over a file feed both a parser and the hash. Wrap it in
+    io.BufferedReader/io.TextIOWrapper to stream, or read() it whole.
+    The digest covers only the bytes read so far, so read to EOF before
+    calling hexdigest().
+    
+    Args:
+        raw: Binary file object opened for reading; closed with the reader
+    """
+    
+    def __init__(self, raw: BinaryIO):
+        super().__init__()
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        n = self.raw.readinto(buffer)
+        if n:
+            self.sha256.update(memoryview(buffer)[:n])
+        return n
+    
+    def readall(self) -> bytes:
+        # One read of the whole file rather than RawIOBase's 8 KiB loop
+        data = self.raw.read()
+        self.sha256.update(data)
+        return data
+    
+    def close(self) -> None:
+        super().close()
+        self.raw.close()
+    
+    def hexdigest(self) -> str:
+        """Hex SHA256 of the bytes read so far."""
+        return self.sha256.hexdigest()
+
+
+def compute_file_hashes(file_paths: Iterable[str], max_workers: int = None) -> Dict[str, str]:
+    """
+    Compute SHA256 hashes of several files in parallel.
+    
+    hashlib releases the GIL while hashing large blocks, so threads hash
+    separate files concurrently.
+    
+    Args:
+        file_paths: Paths to the files
+        max_workers: Number of worker threads (default: CPU count)
+        
+    Returns:
+        Dictionary mapping each path (as given) to its SHA256 hash
+    """
+    file_paths = [str(file_path) for file_path in file_paths]
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return dict(zip(file_paths, executor.map(compute_file_hash, file_paths)))
+
+
+def has_file_hash_cache(conn: sqlite3.Connection) -> bool:
+    """
+    Check whether the database has the file_hash_cache table.
+    
+    Databases created before the table was added get it from --init-db.
+    
+    Args:
+        conn: Database connection
+        
+    Returns:
+        True if file hashes can be cached in this database
+    """
+    cursor = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'file_hash_cache'"
+    )
+    return cursor.fetchone() is not None
+
+
+def get_cached_file_hashes(conn: sqlite3.Connection, file_paths: Iterable[str]) -> Dict[str, str]:
+    """
+    Look up the cached hashes of files that are unchanged since they were hashed.
+    
+    A file counts as unchanged if its absolute path, modification time and
+    size all match the cache entry.
+    
+    Args:
+        conn: Database connection
+        file_paths: Paths to look up
+        
+    Returns:
+        Dictionary mapping each path (as given) to its SHA256 hash; files that
+        are missing, changed or not cached are left out
+    """
+    hashes = {}
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        cursor = conn.execute(
+            "SELECT sha256 FROM file_hash_cache WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (str(Path(file_path).resolve()), stat.st_mtime_ns, stat.st_size)
+        )
+        result = cursor.fetchone()
+        if result:
+            hashes[str(file_path)] = result[0]
+    return hashes
+
+
+def cache_file_hash(conn: sqlite3.Connection, file_path: str, file_hash: str,
+                    stat: os.stat_result) -> None:
+    """
+    Record a file's hash in file_hash_cache.
+    
+    Args:
+        conn: Database connection
+        file_path: Path to the file
+        file_hash: SHA256 hash of the file
+        stat: os.stat() of the file taken before it was read
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO file_hash_cache (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+        (str(Path(file_path).resolve()), stat.st_mtime_ns, stat.st_size, file_hash)
+    )
+
+
+# Default timestamp format written by the iButton software
+IBUTTON_TIMESTAMP_FORMAT = "%m/%d/%y %I:%M:%S %p"
+
+# Timestamp formats written by the iButton software, most common first
+TIMESTAMP_FORMATS = (
+    "%m/%d/%y %I:%M:%S %p",  # 12/31/24 11:59:59 PM
+    "%m/%d/%Y %I:%M:%S %p",  # 12/31/2024 11:59:59 PM
+    "%Y-%m-%d %H:%M:%S",      # 2024-12-31 23:59:59
+    "%m/%d/%y %H:%M:%S",      # 12/31/24 23:59:59
+)
+
+# Fixed-width patterns for the strptime directives make_timestamp_parser()
+# can specialize; formats using any other directive go through strptime
+DIRECTIVE_PATTERNS = {
+    '%Y': r'([0-9]{4})',
+    '%y': r'([0-9]{2})',
+    '%m': r'([0-9]{2})',
+    '%d': r'([0-9]{2})',
+    '%H': r'([0-9]{2})',
+    '%I': r'(0[1-9]|1[0-2])',
+    '%M': r'([0-9]{2})',
+    '%S': r'([0-9]{2})',
+    '%p': r'([AaPp][Mm])',
+}
+
+# Slash formats parsed by parse_ibutton_timestamps(): (year digits, 12-hour clock)
+FIXED_WIDTH_FORMATS = {
+    "%m/%d/%y %I:%M:%S %p": (2, True),
+    "%m/%d/%Y %I:%M:%S %p": (4, True),
+    "%m/%d/%y %H:%M:%S": (2, False),
+}
+
+# Range handled by the vectorized timestamp conversion (datetime64[ns] spans
+# roughly 1677-09-21 to 2262-04-11, less some room for UTC offsets)
+DATETIME64_MIN = pd.Timestamp('1678-01-01')
+DATETIME64_MAX = pd.Timestamp('2261-12-31 23:59:59')
+
+# Naive 1970-01-01, for converting fixed-offset local times to epoch seconds
+UNIX_EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+# Format that last matched, by timestamp shape (see timestamp_shape())
+FORMAT_CACHE: Dict[Tuple[int, int, bool], str] = {}
+
+
+def timestamp_shape(local_time_str: str) -> Tuple[int, int, bool]:
+    """
+    Cheap key that tells the TIMESTAMP_FORMATS apart.
+    
+    Args:
+        local_time_str: Timestamp string
+        
+    Returns:
+        Tuple of (length, number of slashes, has AM/PM marker)
+    """
+    return len(local_time_str), local_time_str.count('/'), 'M' in local_time_str
+
+
+@lru_cache(maxsize=64)
+def parse_utc_offset(fixed_offset: str) -> timedelta:
+    """
+    Parse a fixed UTC offset string.
+    
+    Cached, since the same offset is used for every row of a deployment.
+    
+    Args:
+        fixed_offset: UTC offset (e.g., "-04:00" or "+05:30")
+        
+    Returns:
+        Offset as a timedelta (negative west of UTC)
+    """
+    sign = 1 if fixed_offset[0] == '+' else -1
+    hours, minutes = map(int, fixed_offset[1:].split(':'))
+    return timedelta(hours=sign*hours, minutes=sign*minutes)
+
+
+@lru_cache(maxsize=64)
+def get_timezone(timezone_name: str = "America/New_York",
+                 fixed_offset: str = None) -> tzinfo:
+    """
+    Build the tzinfo used to interpret local sensor timestamps.
+    
+    Cached, so per-row callers such as local_to_utc() don't re-parse the
+    offset or look up the zone for every timestamp.
+    
+    Args:
+        timezone_name: IANA timezone name (e.g., "America/New_York")
+        fixed_offset: Optional fixed UTC offset (e.g., "-04:00" for EDT) to bypass DST
+        
+    Returns:
+        datetime.timezone for a fixed offset, otherwise a ZoneInfo
+    """
+    if fixed_offset:
+        return timezone(parse_utc_offset(fixed_offset))
+    return ZoneInfo(timezone_name)
+
+
+@lru_cache(maxsize=None)
+def make_timestamp_parser(fmt: str) -> Callable[[str], datetime]:
+    """
+    Build a parser specialized for one timestamp format.
+    
+    datetime.strptime() re-dispatches on the format string for every call.
+    For formats made only of fixed-width numeric fields (see
+    DIRECTIVE_PATTERNS) this builds one anchored regex up front and turns
+    its groups into a datetime directly. Strings the regex doesn't match
+    exactly (unpadded fields, extra spaces, impossible dates) are handed
+    to strptime, so results and errors are the same as strptime's.
+    
+    Args:
+        fmt: strptime format, e.g. one of TIMESTAMP_FORMATS
+        
+    Returns:
+        Function taking a timestamp string and returning a naive datetime;
+        raises ValueError if it doesn't match the format
+    """
+    tokens = re.findall(r'%.|[^%]+', fmt)
+    directives = [token for token in tokens if token.startswith('%')]
+    index = {directive: i for i, directive in enumerate(directives)}
+    has_fields = (
+        all(directive in DIRECTIVE_PATTERNS for directive in directives)
+        and len(index) == len(directives)
+        and {'%m', '%d', '%M', '%S'} <= index.keys()
+        and ('%Y' in index) != ('%y' in index)
+        and ('%H' in index) != ('%I' in index and '%p' in index)
+    )
+    if not has_fields:
+        return lambda local_time_str: datetime.strptime(local_time_str, fmt)
+    
+    pattern = re.compile(
+        ''.join(DIRECTIVE_PATTERNS.get(token) or re.escape(token) for token in tokens)
+    )
+    four_digit_year = '%Y' in index
+    year_i = index['%Y' if four_digit_year else '%y']
+    month_i, day_i = index['%m'], index['%d']
+    minute_i, second_i = index['%M'], index['%S']
+    twelve_hour = '%I' in index
+    hour_i = index['%I' if twelve_hour else '%H']
+    ampm_i = index.get('%p')
+    
+    def parse(local_time_str: str) -> datetime:
+        match = pattern.fullmatch(local_time_str)
+        if match is not None:
+            fields = match.groups()
+            year = int(fields[year_i])
+            if not four_digit_year:
+                # %y pivot: 69-99 -> 1900s, 00-68 -> 2000s
+                year += 1900 if year >= 69 else 2000
+            hour = int(fields[hour_i])
+            if twelve_hour:
+                hour = hour % 12 + (12 if fields[ampm_i].upper() == 'PM' else 0)
+            try:
+                return datetime(year, int(fields[month_i]), int(fields[day_i]),
+                                hour, int(fields[minute_i]), int(fields[second_i]))
+            except ValueError:
+                pass  # Let strptime decide, and raise its error
+        return datetime.strptime(local_time_str, fmt)
+    
+    return parse
+
+
+def parse_local_time(local_time_str: str, fmt: str = None) -> Tuple[datetime, str]:
+    """
+    Parse a naive local timestamp string from a sensor file.
+    
+    Args:
+        local_time_str: Timestamp string in format recognized by the sensor
+        fmt: Optional format to try first, typically the one returned for
+            the previous row of the same file. Without it, the format that
+            last matched a timestamp of the same shape is tried first.
+        
+    Returns:
+        Tuple of (naive datetime, format that matched)
+        
+    Raises:
+        ValueError: If timestamp cannot be parsed
+    """
+    shape = None
+    if fmt is None:
+        shape = timestamp_shape(local_time_str)
+        fmt = FORMAT_CACHE.get(shape)
+    if fmt is not None:
+        try:
+            return make_timestamp_parser(fmt)(local_time_str), fmt
+        except ValueError:
+            pass
+    
+    for candidate in TIMESTAMP_FORMATS:
+        if candidate == fmt:
+            continue  # Already tried
+        try:
+            dt = make_timestamp_parser(candidate)(local_time_str)
+        except ValueError:
+            continue
+        if shape is not None:
+            FORMAT_CACHE[shape] = candidate
+        return dt, candidate
+    
+    raise ValueError(f"Could not parse timestamp: {local_time_str}")
+
+
+def local_datetime_to_utc(dt: datetime, tz: tzinfo) -> int:
+    """
+    Convert a naive local datetime to UTC epoch seconds.
+    
+    Handles daylight savings time transitions using the 'fold' attribute.
+    During ambiguous times (fall-back), assumes DST is NOT in effect (fold=1).
+    
+    Args:
+        dt: Naive local datetime
+        tz: Timezone from get_timezone()
+        
+    Returns:
+        Unix epoch seconds in UTC
+    """
+    if isinstance(tz, timezone):
+        # Fixed offset: plain arithmetic, no tzinfo attach or DST lookup
+        return (dt - UNIX_EPOCH) // ONE_SECOND - tz.utcoffset(None) // ONE_SECOND
+    
+    # Handle DST ambiguity: during fall-back, fold=1 means "second occurrence"
+    # (i.e., standard time, not DST)
+    return int(dt.replace(tzinfo=tz, fold=1).timestamp())
+
+
 def local_to_utc(local_time_str: str, timezone_name: str = "America/New_York", 
                  fixed_offset: str = None) -> int:
     """
@@ -79,6 +740,9 @@ def local_to_utc(local_time_str: str, timezone_name: str = "America/New_York",
     Handles daylight savings time transitions using the 'fold' attribute.
     During ambiguous times (fall-back), assumes DST is NOT in effect (fold=1).
     
+    For bulk conversion, call get_timezone() once and use parse_local_time()
+    with local_datetime_to_utc() per row instead.
+    
     Args:
         local_time_str: Timestamp string in format recognized by the sensor
         timezone_name: IANA timezone name (e.g., "America/New_York")
@@ -90,46 +754,153 @@ def local_to_utc(local_time_str: str, timezone_name: str = "America/New_York",
     Raises:
         ValueError: If timestamp cannot be parsed
     """
-    # Common iButton format: MM/DD/YY HH:MM:SS AM/PM
-    # Try multiple common formats
-    formats = [
-        "%m/%d/%y %I:%M:%S %p",  # 12/31/24 11:59:59 PM
-        "%m/%d/%Y %I:%M:%S %p",  # 12/31/2024 11:59:59 PM
-        "%Y-%m-%d %H:%M:%S",      # 2024-12-31 23:59:59
-        "%m/%d/%y %H:%M:%S",      # 12/31/24 23:59:59
-    ]
-    
-    dt = None
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(local_time_str, fmt)
-            break
-        except ValueError:
-            continue
+    dt, _ = parse_local_time(local_time_str)
+    return local_datetime_to_utc(dt, get_timezone(timezone_name, fixed_offset))
+
+
+def parse_ibutton_timestamps(times: pd.Series,
+                             fmt: str = IBUTTON_TIMESTAMP_FORMAT) -> pd.Series:
+    """
+    Parse a column of fixed-width "MM/DD/YY HH:MM:SS AM"-style timestamps without strptime.
     
-    if dt is None:
-        raise ValueError(f"Could not parse timestamp: {local_time_str}")
+    The iButton slash formats (see FIXED_WIDTH_FORMATS) have every field at
+    a fixed position, so the digits are read straight out of a NumPy byte
+    matrix and combined with array arithmetic. Values that don't match the
+    layout exactly (other formats, unpadded fields, impossible dates) come
+    back as NaT so the caller can retry them with a general parser.
     
-    # If fixed offset is provided, use it instead of timezone-aware conversion
-    if fixed_offset:
-        # Parse fixed offset (e.g., "-04:00" or "+05:30")
-        sign = 1 if fixed_offset[0] == '+' else -1
-        hours, minutes = map(int, fixed_offset[1:].split(':'))
-        offset = timedelta(hours=sign*hours, minutes=sign*minutes)
+    Args:
+        times: Series of stripped timestamp strings
+        fmt: One of FIXED_WIDTH_FORMATS (default: the iButton default format)
         
-        # Apply fixed offset
-        utc_dt = dt - offset
-        return int(utc_dt.replace(tzinfo=timezone.utc).timestamp())
+    Returns:
+        Series of naive datetime64[ns] values on the same index
+    """
+    year_digits, twelve_hour = FIXED_WIDTH_FORMATS[fmt]
+    y = year_digits - 2  # Shift of every field after the year
+    width = 15 + year_digits + (3 if twelve_hour else 0)  # e.g. len("12/31/24 11:59:59 PM")
+    result = pd.Series(pd.NaT, index=times.index, dtype='datetime64[ns]')
+    fixed_width = (times.str.len() == width).to_numpy()
+    if not fixed_width.any():
+        return result
     
-    # Otherwise use timezone-aware conversion with DST handling
-    tz = ZoneInfo(timezone_name)
+    values = times[fixed_width].tolist()
+    try:
+        raw = np.asarray(values, dtype=f'S{width}')
+    except UnicodeEncodeError:
+        # Non-ASCII characters can't be valid here; '?' fails the checks below
+        raw = np.asarray([v.encode('ascii', 'replace') for v in values], dtype=f'S{width}')
+    chars = raw.view(np.uint8).reshape(-1, width).astype(np.int64)
+    digits = chars - ord('0')
     
-    # Handle DST ambiguity: during fall-back, fold=1 means "second occurrence"
-    # (i.e., standard time, not DST)
-    localized_dt = dt.replace(tzinfo=tz, fold=1)
+    def field(start: int) -> np.ndarray:
+        return digits[:, start] * 10 + digits[:, start + 1]
+    
+    month, day = field(0), field(3)
+    hour, minute, second = field(9 + y), field(12 + y), field(15 + y)
+    digit_cols = [0, 1, 3, 4] + list(range(6, 8 + y)) \
+        + [9 + y, 10 + y, 12 + y, 13 + y, 15 + y, 16 + y]
+    valid = (
+        ((digits[:, digit_cols] >= 0) & (digits[:, digit_cols] <= 9)).all(axis=1)
+        & (chars[:, 2] == ord('/')) & (chars[:, 5] == ord('/'))
+        & (chars[:, 8 + y] == ord(' '))
+        & (chars[:, 11 + y] == ord(':')) & (chars[:, 14 + y] == ord(':'))
+        & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+        & (minute <= 59) & (second <= 59)
+    )
+    
+    if twelve_hour:
+        lower = chars | 0x20  # ASCII lowercase, %p is case-insensitive
+        is_pm = lower[:, 18 + y] == ord('p')
+        valid &= (
+            (chars[:, 17 + y] == ord(' '))
+            & (is_pm | (lower[:, 18 + y] == ord('a'))) & (lower[:, 19 + y] == ord('m'))
+            & (hour >= 1) & (hour <= 12)
+        )
+        hour = hour % 12 + np.where(is_pm, 12, 0)
+    else:
+        valid &= hour <= 23
+    
+    if year_digits == 4:
+        year = field(6) * 100 + field(8)
+        # Stay inside the datetime64[ns] range; others go to the general parser
+        valid &= (year >= DATETIME64_MIN.year) & (year <= DATETIME64_MAX.year)
+    else:
+        # %y pivot: 69-99 -> 1900s, 00-68 -> 2000s
+        year = field(6)
+        year = np.where(year >= 69, 1900 + year, 2000 + year)
+    month_start = (np.where(valid, year, 1970) - 1970) * 12 + np.where(valid, month, 1) - 1
+    date = month_start.astype('datetime64[M]').astype('datetime64[D]') + (day - 1)
+    # Reject days past the end of the month instead of rolling them over
+    valid &= date.astype('datetime64[M]').astype(np.int64) == month_start
+    
+    seconds = date.astype('datetime64[s]') + (hour * 3600 + minute * 60 + second)
+    parsed = np.where(valid, seconds.astype('datetime64[ns]'), np.datetime64('NaT', 'ns'))
+    result[fixed_width] = parsed
+    return result
+
+
+def in_datetime64_range(local: pd.Series) -> pd.Series:
+    """
+    Blank out datetimes that datetime64[ns] cannot hold.
     
-    # Convert to UTC and return epoch seconds
-    return int(localized_dt.timestamp())
+    Args:
+        local: Series of naive datetimes, any resolution
+        
+    Returns:
+        datetime64[ns] Series with values outside DATETIME64_MIN..DATETIME64_MAX
+        replaced by NaT
+    """
+    return local.where(local.between(DATETIME64_MIN, DATETIME64_MAX)).astype('datetime64[ns]')
+
+
+def local_to_utc_batch(times: pd.Series, timezone_name: str = "America/New_York",
+                       fixed_offset: str = None, fmt: str = None) -> np.ndarray:
+    """
+    Convert a column of local timestamp strings to UTC epoch seconds at once.
+    
+    Vectorized counterpart of local_to_utc(). All values are parsed with a
+    single format, ambiguous fall-back times are taken as standard time
+    (like fold=1), and the conversion runs in pandas rather than per row.
+    
+    Args:
+        times: Timestamp strings (already stripped)
+        timezone_name: IANA timezone name (e.g., "America/New_York")
+        fixed_offset: Optional fixed UTC offset (e.g., "-04:00" for EDT) to bypass DST
+        fmt: Timestamp format; detected from the first non-empty value if not given
+        
+    Returns:
+        Float array of epoch seconds, NaN where a value is empty, does not
+        match the format, or falls in a DST gap; convert those with
+        local_to_utc() one at a time
+    """
+    if fmt is None:
+        first = next((t for t in times if t), None)
+        try:
+            _, fmt = parse_local_time(first)
+        except (TypeError, ValueError):
+            return np.full(len(times), np.nan)
+    
+    if fmt in FIXED_WIDTH_FORMATS:
+        # Fixed-position fast path; misses go to the per-row parser
+        local = parse_ibutton_timestamps(times, fmt)
+    else:
+        local = in_datetime64_range(pd.to_datetime(times, format=fmt, errors='coerce'))
+        # pandas rolls :60/:61 into the next minute where strptime rejects them
+        seconds = pd.to_numeric(times.str.rsplit(':', n=1).str[-1], errors='coerce')
+        local[(seconds > 59).to_numpy()] = pd.NaT
+    
+    if fixed_offset:
+        # A fixed offset is a plain shift; no timezone rules to apply
+        utc = local - pd.Timedelta(parse_utc_offset(fixed_offset))
+        epoch = pd.Timestamp(0)
+    else:
+        # DST-gap times come out as NaT
+        tz = get_timezone(timezone_name)
+        utc = local.dt.tz_localize(tz, ambiguous=np.zeros(len(local), dtype=bool),
+                                   nonexistent='NaT')
+        epoch = pd.Timestamp(0, tz='UTC')
+    return ((utc - epoch) // pd.Timedelta(seconds=1)).to_numpy(dtype=float, na_value=np.nan, copy=True)
 
 
 def file_already_ingested(conn: sqlite3.Connection, sha256: str) -> bool:
@@ -144,8 +915,67 @@ def file_already_ingested(conn: sqlite3.Connection, sha256: str) -> bool:
         True if file exists in database
     """
     cursor = conn.execute(
-        "SELECT COUNT(*) FROM files WHERE sha256 = ?",
+        "SELECT 1 FROM files WHERE sha256 = ? LIMIT 1",
         (sha256,)
     )
-    count = cursor.fetchone()[0]
-    return count > 0
+    return cursor.fetchone() is not None
+
+
+def max_bound_parameters(conn: sqlite3.Connection) -> int:
+    """
+    Get the maximum number of ? parameters one statement may bind.
+    
+    Args:
+        conn: Database connection
+        
+    Returns:
+        SQLITE_LIMIT_VARIABLE_NUMBER for the connection (Python 3.11+),
+        otherwise the conservative pre-3.32 default of 999
+    """
+    if hasattr(conn, 'getlimit'):  # Python 3.11+
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    return DEFAULT_MAX_BOUND_PARAMETERS
+
+
+def batch_files_already_ingested(conn: sqlite3.Connection, hashes: Iterable[str]) -> Set[str]:
+    """
+    Check which of several files have already been ingested.
+    
+    Runs one IN (...) query per max_bound_parameters() hashes instead of
+    one file_already_ingested() query per file.
+    
+    Args:
+        conn: Database connection
+        hashes: File hashes to check
+        
+    Returns:
+        Set of the given hashes that exist in the database
+    """
+    hashes = list(hashes)
+    chunk_size = max_bound_parameters(conn)
+    found = set()
+    for start in range(0, len(hashes), chunk_size):
+        chunk = hashes[start:start + chunk_size]
+        cursor = conn.execute(
+            f"SELECT sha256 FROM files WHERE sha256 IN ({', '.join('?' * len(chunk))})",
+            chunk
+        )
+        found.update(sha256 for sha256, in cursor)
+    return found
+
+
+def get_ingested_files(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Load the hashes of all ingested files in one query.
+    
+    Use this instead of calling file_already_ingested() per file when
+    scanning a directory.
+    
+    Args:
+        conn: Database connection
+        
+    Returns:
+        Dictionary mapping file hash to the sensor_id it was ingested for
+    """
+    cursor = conn.execute("SELECT sha256, sensor_id FROM files")
+    return {sha256: sensor_id for sha256, sensor_id in cursor}
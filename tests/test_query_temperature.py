@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Checks for the query helpers in scripts/query_temperature.py.
+
+Run with: python -m pytest tests  (or python -m unittest discover tests)
+"""
+
+import sqlite3
+import sys
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Import the helpers the same way the scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+from query_temperature import (
+    list_deployment_sensors,
+    list_deployments,
+    list_sensors,
+    read_query_chunked
+)
+
+# Schema the queries run against
+SCHEMA_PATH = Path(__file__).parent.parent / 'schema' / 'temperature.sql'
+
+# The original JOIN/GROUP BY forms of the list_* queries
+BASELINE_LIST_DEPLOYMENTS = """
+    SELECT 
+        d.deployment_id,
+        d.name,
+        d.site,
+        d.timezone_name,
+        COUNT(DISTINCT tr.sensor_id) AS num_sensors,
+        COUNT(tr.reading_id) AS num_readings,
+        datetime(MIN(tr.time_utc), 'unixepoch') AS first_reading_utc,
+        datetime(MAX(tr.time_utc), 'unixepoch') AS last_reading_utc
+    FROM deployments d
+    LEFT JOIN temperature_readings tr ON d.deployment_id = tr.deployment_id
+    GROUP BY d.deployment_id
+    ORDER BY d.name
+"""
+
+BASELINE_LIST_SENSORS = """
+    SELECT 
+        s.sensor_id,
+        s.sensor_type,
+        s.part_number,
+        s.registration_number,
+        s.label,
+        COUNT(DISTINCT tr.deployment_id) AS num_deployments,
+        COUNT(tr.reading_id) AS num_readings
+    FROM sensors s
+    LEFT JOIN temperature_readings tr ON s.sensor_id = tr.sensor_id
+    GROUP BY s.sensor_id
+    ORDER BY s.registration_number
+"""
+
+BASELINE_LIST_DEPLOYMENT_SENSORS = """
+    SELECT 
+        s.sensor_id,
+        s.label,
+        s.registration_number,
+        sd.location_notes AS location,
+        COUNT(tr.reading_id) AS num_readings,
+        datetime(MIN(tr.time_utc), 'unixepoch') AS first_reading_utc,
+        datetime(MAX(tr.time_utc), 'unixepoch') AS last_reading_utc
+    FROM sensors s
+    JOIN sensor_deployments sd ON s.sensor_id = sd.sensor_id
+    JOIN deployments d ON sd.deployment_id = d.deployment_id
+    JOIN temperature_readings tr ON s.sensor_id = tr.sensor_id AND d.deployment_id = tr.deployment_id
+    WHERE d.name = ?
+    GROUP BY s.sensor_id
+    ORDER BY s.label
+"""
+
+
+class ReadQueryChunkedTest(unittest.TestCase):
+    """read_query_chunked() must return what an unchunked read returns."""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.execute("""
+            CREATE TABLE readings (
+                time_utc INTEGER, sensor_label TEXT, value_c REAL, quality_flag INTEGER
+            )
+        """)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def assert_matches_unchunked(self, query, chunksize):
+        expected = pd.read_sql_query(query, self.conn)
+        actual = read_query_chunked(query, self.conn, chunksize=chunksize)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_column_all_null_in_one_chunk(self):
+        # An unlabeled sensor fills the first chunk, a labeled one the second
+        rows = [(i, None if i < 5 else 'Antenna', 20.0 + i, None if i < 5 else 0)
+                for i in range(10)]
+        self.conn.executemany("INSERT INTO readings VALUES (?, ?, ?, ?)", rows)
+        for chunksize in (1, 3, 5, 10, 100):
+            self.assert_matches_unchunked("SELECT * FROM readings ORDER BY time_utc", chunksize)
+            self.assert_matches_unchunked("SELECT * FROM readings ORDER BY time_utc DESC", chunksize)
+
+    def test_mixed_type_column(self):
+        # Untyped expressions keep NULL as None rather than NaN
+        rows = [(i, None, 1.5 if i % 2 else None, None) for i in range(5)] + [(i, 'x', None, 1) for i in range(5, 10)]
+        self.conn.executemany("INSERT INTO readings VALUES (?, ?, ?, ?)", rows)
+        query = "SELECT time_utc, COALESCE(sensor_label, value_c) AS mixed FROM readings"
+        self.assert_matches_unchunked(query, 5)
+
+    def test_empty_result(self):
+        self.assert_matches_unchunked("SELECT * FROM readings", 5)
+
+
+class ListQueriesTest(unittest.TestCase):
+    """The list_* summaries must match the original JOIN/GROUP BY queries."""
+    
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.executescript(SCHEMA_PATH.read_text())
+        self.conn.executescript("""
+            INSERT INTO deployments (deployment_id, name, site) VALUES
+                (1, 'Adak_2025Dec', 'Adak'),
+                (2, 'Barrow_2025Nov', 'Barrow'),
+                (3, 'Empty_2026Jan', 'Nowhere');  -- no readings at all
+            INSERT INTO sensors (sensor_id, sensor_type, registration_number, label) VALUES
+                (1, 'ibutton_ds1925', '0000AAA1', 'Antenna'),
+                (2, 'ibutton_ds1925', '0000AAA2', 'DigitalSpec'),
+                (3, 'ibutton_ds1925', '0000AAA3', NULL),
+                (4, 'ibutton_ds1925', '0000AAA4', 'Spare');  -- never read
+            INSERT INTO sensor_deployments (sensor_id, deployment_id, location_notes) VALUES
+                (1, 1, 'mast'), (2, 1, 'rack'), (3, 1, NULL),
+                (1, 2, 'roof'), (4, 2, 'shelf'), (4, 3, 'box');
+            INSERT INTO files (file_id, deployment_id, sensor_id, path, sha256) VALUES
+                (1, 1, 1, 'a.csv', 'h1'), (2, 1, 2, 'b.csv', 'h2'), (3, 1, 3, 'c.csv', 'h3'),
+                (4, 2, 1, 'd.csv', 'h4'), (5, 1, 1, 'e.csv', 'h5'),
+                (6, 2, 4, 'f.csv', 'h6');  -- header only, no readings
+        """)
+        readings = [
+            (file_id, deployment_id, sensor_id, f"t{time_utc}", time_utc, 20.0)
+            for file_id, deployment_id, sensor_id, start, count in [
+                (1, 1, 1, 1764594000, 4), (2, 1, 2, 1764594060, 3), (3, 1, 3, 1764590000, 2),
+                (4, 2, 1, 1762000000, 5), (5, 1, 1, 1764600000, 1),
+            ]
+            for time_utc in range(start, start + 60 * count, 60)
+        ]
+        self.conn.executemany(
+            """INSERT INTO temperature_readings
+               (file_id, deployment_id, sensor_id, time_local_text, time_utc, value_c)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            readings
+        )
+        self.patcher = mock.patch('query_temperature.pooled_connection', self.fixture_connection)
+        self.patcher.start()
+    
+    def tearDown(self):
+        self.patcher.stop()
+        self.conn.close()
+    
+    @contextmanager
+    def fixture_connection(self, db_path):
+        """Stand-in for pooled_connection() that serves the in-memory fixture."""
+        yield self.conn
+    
+    def assert_matches_baseline(self, actual, query, params=None):
+        expected = pd.read_sql_query(query, self.conn, params=params)
+        # The original queries formatted times as text in SQL
+        for column in ('first_reading_utc', 'last_reading_utc'):
+            if column in actual:
+                actual[column] = actual[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+        self.assertEqual(list(actual.columns), list(expected.columns))
+        self.assertEqual(
+            actual.astype(object).where(actual.notna(), None).values.tolist(),
+            expected.astype(object).where(expected.notna(), None).values.tolist()
+        )
+    
+    def test_list_deployments(self):
+        actual = list_deployments('fixture.sqlite')
+        self.assert_matches_baseline(actual, BASELINE_LIST_DEPLOYMENTS)
+        self.assertEqual(actual.loc[actual['name'] == 'Empty_2026Jan', 'num_readings'].item(), 0)
+    
+    def test_list_sensors(self):
+        self.assert_matches_baseline(list_sensors('fixture.sqlite'), BASELINE_LIST_SENSORS)
+    
+    def test_list_deployment_sensors(self):
+        for name in ('Adak_2025Dec', 'Barrow_2025Nov', 'Empty_2026Jan', 'Missing'):
+            self.assert_matches_baseline(list_deployment_sensors('fixture.sqlite', name),
+                                         BASELINE_LIST_DEPLOYMENT_SENSORS, [name])
+
+
+if __name__ == '__main__':
+    unittest.main()
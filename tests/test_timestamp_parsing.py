@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Equivalence checks for the fast timestamp parsers in scripts/utils.py.
+
+The fast paths (make_timestamp_parser, parse_ibutton_timestamps,
+local_to_utc_batch) must agree with plain datetime.strptime and the
+original per-row local_to_utc() conversion: same results where those
+succeed, and a rejection (ValueError, NaT or NaN) where they fail.
+
+Run with: python -m pytest tests  (or python -m unittest discover tests)
+"""
+
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+# Import the helpers the same way the scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+from utils import (
+    FIXED_WIDTH_FORMATS,
+    TIMESTAMP_FORMATS,
+    local_to_utc,
+    local_to_utc_batch,
+    make_timestamp_parser,
+    parse_ibutton_timestamps
+)
+
+# Hand-picked edge cases: unpadded fields, the %y 68/69 pivot, leap days,
+# leap seconds, AM/PM case, and the 2024 America/New_York DST gap and fold
+EDGE_CASES = [
+    "12/31/24 11:59:59 PM", "1/2/24 3:04:05 AM", "01/02/24 3:04:05 am",
+    "01/02/24 03:04:05 pM", "06/15/68 12:00:00 PM", "06/15/69 12:00:00 AM",
+    "02/29/24 10:00:00 AM", "02/29/23 10:00:00 AM", "02/30/24 10:00:00 AM",
+    "12/30/24 11:59:60 PM", "2/3/24 1:00:61 PM", "00/10/24 01:00:00 AM",
+    "13/10/24 01:00:00 AM", "03/10/24 00:30:00 AM", "03/10/24 13:30:00 PM",
+    "03/10/24 02:30:00 AM", "11/03/24 01:30:00 AM", "11/03/24 01:30:00",
+    "12/31/2024 11:59:59 PM", "2/29/2024 1:00:00 pm", "2/29/2100 01:00:00 AM",
+    "2024-12-31 23:59:59", "2024-1-2 3:4:5", "2024-03-10 02:30:00",
+    "2024-11-03 01:30:00", "2024-02-29 00:00:00", "2023-02-29 00:00:00",
+    "2024-12-31 23:59:60", "2024-12-31 23:60:00", "2024-12-31 24:00:00",
+    "03/10/24 02:30:00", "11/03/24 01:59:59", "12/31/24 23:59:60",
+    "12/31/24  11:59:59 PM", " 12/31/24 11:59:59 PM", "12/31/24 11:59:59 XM",
+    "", "not a timestamp",
+]
+
+# Seed for the generated cases, so failures are reproducible
+RANDOM_SEED = 20241103
+
+# Number of generated timestamps checked per format
+RANDOM_CASES = 2000
+
+
+def reference_local_to_utc(local_time_str, timezone_name="America/New_York", fixed_offset=None):
+    """
+    Original strptime-based conversion that the fast paths must match.
+    
+    Raises:
+        ValueError: If timestamp cannot be parsed
+    """
+    dt = None
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            dt = datetime.strptime(local_time_str, fmt)
+            break
+        except ValueError:
+            continue
+    
+    if dt is None:
+        raise ValueError(f"Could not parse timestamp: {local_time_str}")
+    
+    if fixed_offset:
+        sign = 1 if fixed_offset[0] == '+' else -1
+        hours, minutes = map(int, fixed_offset[1:].split(':'))
+        offset = timedelta(hours=sign*hours, minutes=sign*minutes)
+        return int((dt - offset).replace(tzinfo=timezone.utc).timestamp())
+    
+    return int(dt.replace(tzinfo=ZoneInfo(timezone_name), fold=1).timestamp())
+
+
+def random_timestamps(fmt, count, rng):
+    """Generate timestamp strings for fmt, padded and unpadded, valid and not."""
+    twelve_hour = '%I' in fmt
+    values = []
+    for _ in range(count):
+        fields = {
+            '%m': rng.randint(0, 13),
+            '%d': rng.randint(0, 32),
+            '%y': rng.randint(0, 99),
+            '%Y': rng.choice([1969, 2000, 2023, 2024, 2068, 2100]),
+            '%I': rng.randint(0, 13),
+            '%H': rng.randint(0, 24),
+            '%M': rng.randint(0, 60),
+            '%S': rng.choice([0, 30, 59, 60, 61]),
+        }
+        # Bias towards the DST transition days
+        if rng.random() < 0.2:
+            fields['%m'], fields['%d'] = rng.choice([(3, 10), (11, 3)])
+            fields['%H'] = rng.randint(0, 3)
+            fields['%I'] = rng.randint(1, 3)
+        text = fmt
+        for directive, value in fields.items():
+            width = 4 if directive == '%Y' else 2
+            digits = str(value).zfill(width) if rng.random() < 0.8 else str(value)
+            text = text.replace(directive, digits)
+        if twelve_hour:
+            text = text.replace('%p', rng.choice(['AM', 'PM', 'am', 'pm', 'Am', 'pM']))
+        values.append(text)
+    return values
+
+
+def strptime_or_none(value, fmt):
+    """datetime.strptime(), returning None instead of raising ValueError."""
+    try:
+        return datetime.strptime(value, fmt)
+    except ValueError:
+        return None
+
+
+def reference_or_none(value, timezone_name, fixed_offset):
+    """reference_local_to_utc(), returning None instead of raising ValueError."""
+    try:
+        return reference_local_to_utc(value, timezone_name, fixed_offset)
+    except ValueError:
+        return None
+
+
+class TimestampParsingTest(unittest.TestCase):
+    """Compare the fast parsers with strptime on edge and random cases."""
+
+    def cases(self, fmt):
+        """Edge cases plus seeded random timestamps for one format."""
+        rng = random.Random(f"{RANDOM_SEED}:{fmt}")
+        return EDGE_CASES + random_timestamps(fmt, RANDOM_CASES, rng)
+
+    def test_make_timestamp_parser_matches_strptime(self):
+        for fmt in TIMESTAMP_FORMATS:
+            parse = make_timestamp_parser(fmt)
+            for value in self.cases(fmt):
+                expected = strptime_or_none(value, fmt)
+                try:
+                    actual = parse(value)
+                except ValueError:
+                    actual = None
+                self.assertEqual(actual, expected, f"{value!r} with {fmt!r}")
+
+    def test_parse_ibutton_timestamps_matches_strptime(self):
+        for fmt in FIXED_WIDTH_FORMATS:
+            values = self.cases(fmt)
+            parsed = parse_ibutton_timestamps(pd.Series(values), fmt)
+            for value, actual in zip(values, parsed):
+                expected = strptime_or_none(value, fmt)
+                # Unpadded values are left to the general parser
+                if pd.isna(actual):
+                    continue
+                self.assertEqual(actual.to_pydatetime(), expected, f"{value!r} with {fmt!r}")
+
+    def test_local_to_utc_matches_reference(self):
+        for timezone_name, fixed_offset in [("America/New_York", None), ("UTC", "-05:00")]:
+            for fmt in TIMESTAMP_FORMATS:
+                for value in self.cases(fmt):
+                    expected = reference_or_none(value, timezone_name, fixed_offset)
+                    try:
+                        actual = local_to_utc(value, timezone_name, fixed_offset)
+                    except ValueError:
+                        actual = None
+                    self.assertEqual(actual, expected, f"{value!r} in {timezone_name}/{fixed_offset}")
+
+    def test_local_to_utc_batch_matches_reference(self):
+        # NaN means "convert this row with local_to_utc()", so a batch
+        # result must either be NaN or equal the per-row result
+        for timezone_name, fixed_offset in [("America/New_York", None), ("UTC", "-05:00")]:
+            for fmt in TIMESTAMP_FORMATS:
+                values = self.cases(fmt)
+                batch = local_to_utc_batch(pd.Series(values), timezone_name, fixed_offset, fmt)
+                for value, actual in zip(values, batch):
+                    if np.isnan(actual):
+                        continue
+                    expected = reference_or_none(value, timezone_name, fixed_offset)
+                    self.assertEqual(actual, expected, f"{value!r} with {fmt!r} in {timezone_name}/{fixed_offset}")
+
+    def test_local_to_utc_batch_converts_common_values(self):
+        # The fast path should not silently hand everything back per row
+        values = pd.Series(["12/31/24 11:59:59 PM", "11/03/24 01:30:00 AM", "02/29/24 10:00:00 AM"])
+        batch = local_to_utc_batch(values, "America/New_York")
+        self.assertEqual(list(batch), [reference_local_to_utc(value) for value in values])
+
+
+if __name__ == '__main__':
+    unittest.main()
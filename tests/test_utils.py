@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Checks for the database and file helpers in scripts/utils.py.
+
+Run with: python -m pytest tests  (or python -m unittest discover tests)
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Import the helpers the same way the scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+from utils import (
+    HASH_CHUNK_SIZE,
+    HASH_MMAP_THRESHOLD,
+    batch_files_already_ingested,
+    bulk_insert,
+    compute_file_hash,
+    compute_file_hashes,
+    transaction
+)
+
+# Schema the helpers run against
+SCHEMA_PATH = Path(__file__).parent.parent / 'schema' / 'temperature.sql'
+
+
+class FileHashTest(unittest.TestCase):
+    """Hashes must equal hashlib's SHA256 of the whole file."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # Sizes around the block size and the memory-map threshold
+        sizes = [0, 1, HASH_CHUNK_SIZE - 1, HASH_CHUNK_SIZE + 1, HASH_MMAP_THRESHOLD + 3]
+        self.paths = []
+        for i, size in enumerate(sizes):
+            path = Path(self.tmp.name) / f"file{i}.csv"
+            path.write_bytes(os.urandom(size))
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compute_file_hash(self):
+        for path in self.paths:
+            expected = hashlib.sha256(path.read_bytes()).hexdigest()
+            self.assertEqual(compute_file_hash(str(path)), expected, path.name)
+
+    def test_compute_file_hashes_matches_compute_file_hash(self):
+        hashes = compute_file_hashes(self.paths, max_workers=3)
+        self.assertEqual(list(hashes), [str(path) for path in self.paths])
+        for path in self.paths:
+            self.assertEqual(hashes[str(path)], compute_file_hash(str(path)), path.name)
+
+    def test_compute_file_hashes_empty(self):
+        self.assertEqual(compute_file_hashes([]), {})
+
+
+class BulkInsertTest(unittest.TestCase):
+    """bulk_insert() inside and outside a caller's transaction."""
+    
+    SQL = "INSERT INTO readings (time_utc, value_c) VALUES (?, ?)"
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / 'test.sqlite')
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.conn.execute("CREATE TABLE readings (time_utc INTEGER, value_c REAL)")
+        self.rows = [(i, i / 10) for i in range(7)]
+    
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+    
+    def stored_rows(self):
+        """Rows visible to a separate connection, i.e. committed."""
+        other = sqlite3.connect(self.db_path)
+        try:
+            return other.execute("SELECT time_utc, value_c FROM readings ORDER BY time_utc").fetchall()
+        finally:
+            other.close()
+    
+    def test_autocommit_commits_each_batch(self):
+        count = bulk_insert(self.conn, self.SQL, iter(self.rows), batch_size=3)
+        self.assertEqual(count, len(self.rows))
+        self.assertFalse(self.conn.in_transaction)
+        self.assertEqual(self.stored_rows(), self.rows)
+    
+    def test_joins_callers_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with transaction(self.conn):
+                count = bulk_insert(self.conn, self.SQL, self.rows, batch_size=3)
+                self.assertEqual(count, len(self.rows))
+                self.assertTrue(self.conn.in_transaction)
+                raise RuntimeError("roll back")
+        # Nothing was committed behind the caller's back
+        self.assertEqual(self.stored_rows(), [])
+    
+    def test_empty_rows(self):
+        self.assertEqual(bulk_insert(self.conn, self.SQL, []), 0)
+        self.assertEqual(self.stored_rows(), [])
+
+
+class BatchFilesAlreadyIngestedTest(unittest.TestCase):
+    """batch_files_already_ingested() across IN (...) chunk boundaries."""
+    
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.executescript(SCHEMA_PATH.read_text())
+        self.ingested = [f"{i:064x}" for i in range(5)]
+        self.conn.executemany(
+            "INSERT INTO files (deployment_id, sensor_id, path, sha256) VALUES (1, 1, ?, ?)",
+            [(f"file{i}.csv", sha256) for i, sha256 in enumerate(self.ingested)]
+        )
+    
+    def tearDown(self):
+        self.conn.close()
+    
+    def test_chunks_cover_every_hash(self):
+        new = [f"{i:064x}" for i in range(100, 104)]
+        hashes = [value for pair in zip(self.ingested, new) for value in pair] + self.ingested[4:]
+        queries = []
+        self.conn.set_trace_callback(queries.append)
+        # Two hashes per query forces five chunks for nine hashes
+        with mock.patch('utils.max_bound_parameters', return_value=2):
+            found = batch_files_already_ingested(self.conn, iter(hashes))
+        self.assertEqual(found, set(self.ingested))
+        self.assertEqual(len([query for query in queries if 'FROM files' in query]), 5)
+    
+    def test_default_chunk_size(self):
+        self.assertEqual(batch_files_already_ingested(self.conn, self.ingested + ['0' * 63 + 'f']),
+                         set(self.ingested))
+    
+    def test_no_hashes(self):
+        self.assertEqual(batch_files_already_ingested(self.conn, []), set())
+
+
+if __name__ == '__main__':
+    unittest.main()